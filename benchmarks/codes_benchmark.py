@@ -0,0 +1,102 @@
+"""
+Compare analytics on decoded label columns with analytics on integer codes
+
+Usage:
+    python benchmarks/codes_benchmark.py [file_name] [--repeat N]
+
+Reports the memory taken by the *_label columns that decode_categorical_data
+adds (as strings and as categoricals) next to the code columns they are
+derived from, and the median time of
+the filters and groupbys the analyses run, done on labels vs on codes.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.analyzer import (  # noqa: E402
+    ATTEMPT,
+    CARD_CODES,
+    EVENT_TYPES,
+    ON_TARGET,
+    decode_categorical_data,
+    isin_codes,
+)
+from src.cleaner import clean_data  # noqa: E402
+from src.loader import load_data_csv  # noqa: E402
+from src.schema import EVENTS_DTYPES  # noqa: E402
+
+COLUMNS = [
+    "id_event", "time", "event_type", "side", "event_team", "opponent", "player",
+    "shot_place", "shot_outcome", "is_goal", "location", "bodypart", "assist_method",
+    "situation", "fast_break",
+]
+
+CARD_LABELS = [EVENT_TYPES[code] for code in CARD_CODES]
+
+# (name, label version, code version) of the operations the analyses perform
+OPERATIONS = [
+    ('shots filter',
+     lambda df: df[df['event_type_label'] == 'Attempt'],
+     lambda df: df[df['event_type'] == ATTEMPT]),
+    ('cards filter',
+     lambda df: df[df['event_type_label'].isin(CARD_LABELS)],
+     lambda df: df[isin_codes(df['event_type'], CARD_CODES)]),
+    ('on-target count',
+     lambda df: (df['shot_outcome_label'] == 'On target').sum(),
+     lambda df: (df['shot_outcome'] == ON_TARGET).sum()),
+    ('event breakdown',
+     lambda df: df['event_type_label'].value_counts(),
+     lambda df: df['event_type'].value_counts()),
+    ('cards by team',
+     lambda df: df.groupby(['event_team', 'event_type_label'], observed=True).size(),
+     lambda df: df.groupby(['event_team', 'event_type'], observed=True).size()),
+]
+
+
+def median_seconds(func, df, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file_name', nargs='?', default='events.csv')
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    with redirect_stdout(io.StringIO()):
+        df = load_data_csv(args.file_name, columns=COLUMNS, dtype=EVENTS_DTYPES)
+        df = decode_categorical_data(clean_data(df, dropna_cols=['event_type', 'time']))
+
+    label_columns = [col for col in df.columns if col.endswith('_label')]
+    code_columns = [col[:-len('_label')] for col in label_columns]
+    label_bytes = df[label_columns].memory_usage(index=False, deep=True).sum()
+    code_bytes = df[code_columns].memory_usage(index=False, deep=True).sum()
+    categorical = decode_categorical_data(df[code_columns], categorical=True)
+    categorical_bytes = categorical[label_columns].memory_usage(index=False, deep=True).sum()
+
+    print(f"Rows: {len(df)}, repeats: {args.repeat}\n")
+    print(f"Label columns ({len(label_columns)}): {label_bytes / 1024 ** 2:8.2f} MB")
+    print(f"Categorical   ({len(label_columns)}): {categorical_bytes / 1024 ** 2:8.2f} MB")
+    print(f"Code columns  ({len(code_columns)}): {code_bytes / 1024 ** 2:8.2f} MB\n")
+
+    print(f"{'Operation':<18} {'Labels':>10} {'Codes':>10} {'Speedup':>9}")
+    print("-" * 50)
+    for name, on_labels, on_codes in OPERATIONS:
+        label_time = median_seconds(on_labels, df, args.repeat)
+        code_time = median_seconds(on_codes, df, args.repeat)
+        print(f"{name:<18} {label_time * 1000:>8.2f}ms {code_time * 1000:>8.2f}ms "
+              f"{label_time / code_time:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
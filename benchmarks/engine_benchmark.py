@@ -0,0 +1,123 @@
+"""
+Compare the single-pass analysis engine with the per-function analyzer path
+
+Usage:
+    python benchmarks/engine_benchmark.py [file_name] [--repeat N]
+
+Loads and prepares data/raw/<file_name> like main.py, then reports median
+wall time and the number of full-length column passes for each path. The
+result cache is cleared before every run.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cache import RESULT_CACHE  # noqa: E402
+from src.analyzer import (  # noqa: E402
+    analyze_events_overview,
+    decode_categorical_data,
+    disciplinary_analysis,
+    location_analysis,
+    player_performance_analysis,
+    team_performance_analysis,
+    time_analysis,
+)
+from src.cleaner import clean_data  # noqa: E402
+from src.engine import run_all_analyses  # noqa: E402
+from src.loader import load_data_csv  # noqa: E402
+from src.schema import EVENTS_DTYPES  # noqa: E402
+
+COLUMNS = [
+    "id_event", "time", "event_type", "side", "event_team", "opponent", "player",
+    "shot_place", "shot_outcome", "is_goal", "location", "bodypart", "assist_method",
+    "situation", "fast_break",
+]
+
+
+class ScanCountingFrame(pd.DataFrame):
+    """
+    DataFrame that counts column passes over full-length frames
+
+    Every column read (``df[col]``) and every column copied by a row filter
+    (``df[mask]``) on a frame with ``full_rows`` rows counts as one pass.
+    Passes made inside pandas (e.g. groupby on a column name) are not seen, so
+    the count is a lower bound for both paths.
+    """
+
+    _metadata = ['scan_log', 'full_rows']
+
+    @property
+    def _constructor(self):
+        return ScanCountingFrame
+
+    def __getitem__(self, key):
+        log = getattr(self, 'scan_log', None)
+        if log is not None and len(self) == self.full_rows:
+            if isinstance(key, str):
+                log.append(1)
+            elif isinstance(key, list) and all(isinstance(col, str) for col in key):
+                log.append(len(key))
+            else:
+                log.append(len(self.columns))
+        return super().__getitem__(key)
+
+
+def per_function_path(df: pd.DataFrame) -> dict:
+    return {
+        'overview': analyze_events_overview(df),
+        'team_stats': team_performance_analysis(df),
+        'player_stats': player_performance_analysis(df),
+        'location_stats': location_analysis(df),
+        'discipline_stats': disciplinary_analysis(df),
+        'time_stats': time_analysis(df),
+    }
+
+
+def count_passes(func, df: pd.DataFrame) -> int:
+    frame = ScanCountingFrame(df)
+    frame.scan_log = []
+    frame.full_rows = len(df)
+    RESULT_CACHE.clear()
+    func(frame)
+    return sum(frame.scan_log)
+
+
+def median_seconds(func, df: pd.DataFrame, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        RESULT_CACHE.clear()
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file_name', nargs='?', default='events.csv')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with redirect_stdout(io.StringIO()):
+        df = load_data_csv(args.file_name, columns=COLUMNS, dtype=EVENTS_DTYPES)
+        df = decode_categorical_data(clean_data(df, dropna_cols=['event_type', 'time']))
+
+    print(f"Rows: {len(df)}, repeats: {args.repeat}\n")
+    print(f"{'Path':<16} {'Median time':>12} {'Column passes':>15}")
+    print("-" * 45)
+    results = {}
+    for name, func in [('per-function', per_function_path), ('engine', run_all_analyses)]:
+        results[name] = median_seconds(func, df, args.repeat)
+        print(f"{name:<16} {results[name]:>11.3f}s {count_passes(func, df):>15}")
+    print(f"\nSpeedup: {results['per-function'] / results['engine']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
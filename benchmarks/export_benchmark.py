@@ -0,0 +1,47 @@
+"""
+Compare export formats: file size, write throughput and read-back time
+
+Usage:
+    python benchmarks/export_benchmark.py [file_name] [--partition-by event_team]
+        [--row-group-size N]
+
+Loads, cleans and decodes data/raw/<file_name> the way main.py does, then
+writes the processed events as CSV (plain and gzip), Parquet (uncompressed,
+snappy, zstd) and Arrow IPC (lz4, zstd) with src.exporter.compare_formats.
+"""
+import argparse
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from main import COLUMNS_TO_KEEP  # noqa: E402
+from src.analyzer import decode_categorical_data  # noqa: E402
+from src.cleaner import clean_data  # noqa: E402
+from src.exporter import DEFAULT_ROW_GROUP_SIZE, compare_formats  # noqa: E402
+from src.loader import load_data_csv  # noqa: E402
+from src.schema import EVENTS_DTYPES  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file_name', nargs='?', default='events.csv')
+    parser.add_argument('--partition-by', default=None, help="Comma-separated partition columns")
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    args = parser.parse_args()
+
+    with redirect_stdout(io.StringIO()):
+        df = load_data_csv(args.file_name, columns=COLUMNS_TO_KEEP, dtype=EVENTS_DTYPES)
+        df = decode_categorical_data(clean_data(df), categorical=True)
+    partition_cols = args.partition_by.split(',') if args.partition_by else None
+
+    print(f"Rows: {len(df)}, partitioned by: {partition_cols or '-'}\n")
+    report = compare_formats(df, partition_cols=partition_cols, row_group_size=args.row_group_size)
+    report['MB'] = (report.pop('bytes') / 1024 ** 2).round(2)
+    print(report.to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Measure CLI startup import time with and without the plotting stack
+
+Usage:
+    python benchmarks/import_benchmark.py [--repeat N]
+
+Runs ``python -X importtime`` in fresh interpreters for ``import main``
+(what an analysis-only run pays, since matplotlib and seaborn are imported on
+first plot) and for ``import main`` followed by the plotting stack (what every
+run paid when src.visualizer imported pyplot at module load), and reports the
+median total import time of each and the import time of the heavy packages.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+SCENARIOS = [
+    ('analysis only', "import main"),
+    ('with plotting', "import main; from src.visualizer import _plotting; _plotting()"),
+]
+
+# Packages whose cumulative import time is reported, wherever they are first imported
+TRACKED = ['numpy', 'pandas', 'pyarrow', 'matplotlib', 'matplotlib.pyplot', 'seaborn']
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def import_times(code: str):
+    """
+    Total import time of ``code`` and cumulative time of the TRACKED packages
+
+    Returns:
+        Tuple of (total microseconds, {package: microseconds})
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=True)
+    total = 0
+    packages = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        # Top-level imports are printed with a single space of indentation
+        if len(match.group(3)) == 1:
+            total += int(match.group(2))
+        if match.group(4) in TRACKED:
+            packages[match.group(4)] = int(match.group(2))
+    return total, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    totals = {}
+    packages = {}
+    for name, code in SCENARIOS:
+        runs = [import_times(code) for _ in range(args.repeat)]
+        totals[name] = sorted(total for total, _ in runs)[len(runs) // 2] / 1e6
+        packages[name] = runs[-1][1]
+
+    print(f"Repeats: {args.repeat}\n")
+    print(f"{'Scenario':<16} {'Import time':>12}")
+    print("-" * 29)
+    for name, seconds in totals.items():
+        print(f"{name:<16} {seconds:>11.3f}s")
+    print(f"\nSaved by lazy plotting imports: {totals['with plotting'] - totals['analysis only']:.3f}s")
+
+    print(f"\n{'Package':<20}" + "".join(f"{name:>16}" for name in totals))
+    print("-" * (20 + 16 * len(totals)))
+    for package in TRACKED:
+        cells = [packages[name].get(package) for name in totals]
+        print(f"{package:<20}" + "".join(f"{'-' if micros is None else f'{micros / 1e6:.3f}s':>16}"
+                                         for micros in cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Time every pipeline stage at several data sizes and flag regressions
+
+Usage:
+    python benchmarks/pipeline_benchmark.py [file_name] [--sizes 10000,100000]
+        [--repeat N] [--no-plots] [--output results.json]
+        [--compare baseline.json] [--threshold 0.10] [--synthetic] [--seed N]
+
+Builds one CSV per size from data/raw/<file_name> (truncated, or repeated with
+unique event ids when the size exceeds the file), or with ``--synthetic``
+generates it with src.synthetic (no raw file needed), and runs load_data_csv (load
+cache disabled), filter_columns, clean_data, decode_categorical_data, every
+analysis, report generation, exports and every dashboard plot on it. Each
+stage is timed ``--repeat`` times (median wall and CPU time) and run once more
+under tracemalloc for its peak memory. Results are written as JSON; with
+``--compare`` stages slower than the baseline by more than ``--threshold`` are
+listed and the exit status is 1.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.analyzer import (  # noqa: E402
+    ANALYSES,
+    decode_categorical_data,
+    generate_summary_report,
+    save_data_exports,
+)
+from src.cache import RESULT_CACHE  # noqa: E402
+from src.cleaner import clean_data, filter_columns  # noqa: E402
+from src.loader import _raw_file_path, load_data_csv  # noqa: E402
+from src.schema import EVENTS_DTYPES  # noqa: E402
+from src.synthetic import write_events  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+COLUMNS = [
+    "id_odsp", "id_event", "time", "event_type", "side", "event_team", "opponent", "player",
+    "shot_place", "shot_outcome", "is_goal", "location", "bodypart", "assist_method",
+    "situation", "fast_break",
+]
+
+
+def sized_csv(source: pd.DataFrame, size: int, directory: str) -> str:
+    """Write the first ``size`` rows of ``source`` (repeated with unique ids if needed) as a CSV"""
+    copies = -(-size // len(source))
+    frames = []
+    for i in range(copies):
+        frame = source.copy() if i else source
+        if i:
+            frame['id_event'] = frame['id_event'].astype(str) + f"_{i}"
+        frames.append(frame)
+    path = os.path.join(directory, f"events_{size}.csv")
+    pd.concat(frames, ignore_index=True).head(size).to_csv(path, index=False)
+    return path
+
+
+def rows(value):
+    return len(value) if isinstance(value, (pd.DataFrame, pd.Series)) else None
+
+
+def remove_files(value) -> None:
+    """Delete the files a stage wrote (exports and plots), so repeats don't pile up"""
+    paths = value.values() if isinstance(value, dict) else [value] if isinstance(value, str) else []
+    for path in paths:
+        if isinstance(path, str) and os.path.isfile(path):
+            os.remove(path)
+
+
+def measure(func, repeat: int) -> dict:
+    """Median wall / CPU time over ``repeat`` calls plus one traced call for peak memory"""
+    walls, cpus = [], []
+    value = None
+    for _ in range(repeat):
+        RESULT_CACHE.clear()
+        wall, cpu = time.perf_counter(), time.process_time()
+        with redirect_stdout(io.StringIO()):
+            value = func()
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+        remove_files(value)
+
+    RESULT_CACHE.clear()
+    tracemalloc.start()
+    with redirect_stdout(io.StringIO()):
+        traced = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    remove_files(traced)
+
+    return {
+        'wall_seconds': round(sorted(walls)[len(walls) // 2], 5),
+        'cpu_seconds': round(sorted(cpus)[len(cpus) // 2], 5),
+        'peak_mb': round(peak / 1024 ** 2, 3),
+        'rows_out': rows(value),
+    }, value
+
+
+def benchmark_size(path: str, repeat: int, plots: bool) -> dict:
+    stages = {}
+
+    def run(name, func, rows_in=None):
+        stats, value = measure(func, repeat)
+        stats['rows_in'] = rows_in
+        stages[name] = stats
+        print(f"  {name:<32} {stats['wall_seconds']:>9.4f}s {stats['cpu_seconds']:>9.4f}s "
+              f"{stats['peak_mb']:>9.2f} MB")
+        return value
+
+    raw = run('load_data_csv', lambda: load_data_csv(path, columns=COLUMNS, dtype=EVENTS_DTYPES, use_cache=False))
+    filtered = run('filter_columns', lambda: filter_columns(raw, COLUMNS), len(raw))
+    cleaned = run('clean_data', lambda: clean_data(filtered, dropna_cols=['event_type', 'time']), len(filtered))
+    df = run('decode_categorical_data', lambda: decode_categorical_data(cleaned, categorical=True), len(cleaned))
+    for name, analysis in ANALYSES.items():
+        run(f'analysis:{name}', lambda analysis=analysis: analysis(df), len(df))
+    run('generate_summary_report', lambda: generate_summary_report(df), len(df))
+    run('save_data_exports', lambda: save_data_exports(df), len(df))
+    if plots:
+        from src.visualizer import DASHBOARD_PLOTS, _plotting, plot_shot_map
+
+        _plotting()  # import the plotting stack outside the timed calls
+        for name, (_, build_inputs, render) in DASHBOARD_PLOTS.items():
+            run(f'plot:{name}', lambda build_inputs=build_inputs, render=render: render(build_inputs(df)), len(df))
+        run('plot:shot_map', lambda: plot_shot_map(df), len(df))
+    return stages
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__)).stdout.strip()
+    except OSError:
+        return ''
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Stages whose median wall time grew by more than ``threshold`` vs the baseline"""
+    regressions = []
+    for size, stages in results['sizes'].items():
+        for stage, stats in stages.items():
+            before = baseline.get('sizes', {}).get(size, {}).get(stage)
+            if before and before['wall_seconds'] > 0:
+                ratio = stats['wall_seconds'] / before['wall_seconds']
+                if ratio > 1 + threshold:
+                    regressions.append((size, stage, before['wall_seconds'], stats['wall_seconds'], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file_name', nargs='?', default='events.csv')
+    parser.add_argument('--sizes', default='10000,50000,200000',
+                        help="Comma-separated row counts")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-plots', action='store_true')
+    parser.add_argument('--output', default=None,
+                        help="JSON results path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--compare', default=None, help="Baseline JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Relative slowdown reported as a regression (default: 0.10)")
+    parser.add_argument('--synthetic', action='store_true',
+                        help="Benchmark on generated events instead of file_name")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for --synthetic")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    source = None if args.synthetic else pd.read_csv(_raw_file_path(args.file_name))
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'file_name': f"synthetic(seed={args.seed})" if args.synthetic else args.file_name,
+        'repeat': args.repeat,
+        'sizes': {},
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            if args.synthetic:
+                path = os.path.join(directory, f"events_{size}.csv")
+                with redirect_stdout(io.StringIO()):
+                    write_events(path, size, seed=args.seed)
+            else:
+                path = sized_csv(source, size, directory)
+            print(f"\nRows: {size}")
+            print(f"  {'Stage':<32} {'Wall':>10} {'CPU':>10} {'Peak mem':>12}")
+            results['sizes'][str(size)] = benchmark_size(path, args.repeat, not args.no_plots)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        print(f"\nCompared with {args.compare} ({baseline.get('commit', '?')}), "
+              f"threshold {args.threshold:.0%}:")
+        for size, stage, before, after, ratio in regressions:
+            print(f"  REGRESSION rows={size} {stage:<32} {before:.4f}s -> {after:.4f}s ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print("  No regressions")
+
+
+if __name__ == '__main__':
+    main()
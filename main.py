@@ -1,105 +1,101 @@
+"""
+Football match events analysis
+
+Usage:
+    python main.py [input] [--analyses team,player] [--ginf PATH] [--no-plots] [--no-exports]
+                   [--no-report] [--format text|json] [--stream] [--chunksize N]
+                   [--profile] [--profile-json PATH] [--profile-dir DIR]
+                   [--dedup-key id_event] [--seen-keys DIR]
+                   [--export-format csv|parquet|arrow] [--compression CODEC] [--partition-by COLS]
+                   [--incremental]
+
+Only the requested work runs, and modules for skipped outputs (plotting,
+match analysis, exports) are never imported.
+"""
+import argparse
+import contextlib
+import json
 import os
-from src.loader import load_data_csv
-from src.cleaner import clean_data, filter_columns
-from src.analyzer import (
-    decode_categorical_data,
-    analyze_events_overview,
-    team_performance_analysis,
-    player_performance_analysis,
-    location_analysis,
-    disciplinary_analysis,
-    time_analysis,
-    generate_summary_report
-)
-from src.visualizer import create_dashboard, plot_shot_map
-
-def main():
-    # Load data
-    print("Loading data...")
-    df = load_data_csv('events.csv')
-    
-    # Define columns to keep
-    columns_to_keep = [
-        "id_event",
-        "time",
-        "event_type",
-        "side",
-        "event_team",
-        "opponent",
-        "player",
-        "shot_place",
-        "shot_outcome",
-        "is_goal",
-        "location",
-        "bodypart",
-        "assist_method",
-        "situation",
-        "fast_break"
-    ]
-    
-    # Filter and clean data
-    print("\nFiltering and cleaning data...")
-    df_filtered = filter_columns(df, columns_to_keep)
-    df_cleaned = clean_data(df_filtered)
-    
-    # Decode categorical data ONCE
-    print("Decoding categorical data...")
-    df_final = decode_categorical_data(df_cleaned)
-    
-    print("Original data shape:", df.shape)
-    print("Filtered and cleaned data shape:", df_cleaned.shape)
-    print("Final decoded data shape:", df_final.shape)
-    
-    # Generate analyses
-    print("\n" + "="*50)
-    print("RUNNING ANALYSES")
-    print("="*50)
-    
-    # Overview analysis
+import sys
+
+# Define columns to keep
+COLUMNS_TO_KEEP = [
+    "id_odsp",
+    "id_event",
+    "time",
+    "event_type",
+    "side",
+    "event_team",
+    "opponent",
+    "player",
+    "shot_place",
+    "shot_outcome",
+    "is_goal",
+    "location",
+    "bodypart",
+    "assist_method",
+    "situation",
+    "fast_break"
+]
+
+# --analyses names -> result names
+ANALYSIS_NAMES = {
+    'overview': 'overview',
+    'team': 'team_stats',
+    'player': 'player_stats',
+    'location': 'location_stats',
+    'discipline': 'discipline_stats',
+    'time': 'time_stats',
+    'matches': 'matches',
+    'league': 'league_stats',
+}
+
+
+def print_overview(overview):
     print("\n1. Overview Analysis:")
-    overview = analyze_events_overview(df_final)
     for key, value in overview.items():
         if isinstance(value, dict) and len(value) > 5:
             print(f"  {key}: {dict(list(value.items())[:3])}... ({len(value)} total)")
         else:
             print(f"  {key}: {value}")
-    
-    # Team performance
+
+
+def print_team_stats(team_stats):
     print("\n2. Team Performance:")
-    team_stats = team_performance_analysis(df_final)
     if not team_stats.empty:
         print(team_stats.head())
     else:
         print("  No team data available")
-    
+
+
+def print_player_stats(player_stats):
     # Player performance (top 10)
     print("\n3. Top Players:")
-    player_stats = player_performance_analysis(df_final)
     if not player_stats.empty:
         print(player_stats.head(10))
     else:
         print("  No player data available")
-    
-    # Location analysis
+
+
+def print_location_stats(location_stats):
     print("\n4. Location Analysis:")
-    location_stats = location_analysis(df_final)
     for category, data in location_stats.items():
         print(f"  {category}:")
         for item, count in list(data.items())[:5]:
             print(f"    {item}: {count}")
-    
-    # Disciplinary analysis
+
+
+def print_discipline_stats(discipline_stats):
     print("\n5. Disciplinary Analysis:")
-    discipline_stats = disciplinary_analysis(df_final)
     for key, value in discipline_stats.items():
         if isinstance(value, dict) and len(value) > 3:
             print(f"  {key}: {dict(list(value.items())[:3])}")
         else:
             print(f"  {key}: {value}")
-    
-    # Time analysis
+
+
+def print_time_stats(time_stats):
     print("\n6. Time Analysis:")
-    time_stats = time_analysis(df_final)
     for category, data in time_stats.items():
         print(f"  {category}:")
         if isinstance(data, dict):
@@ -107,47 +103,251 @@ def main():
                 print(f"    {period}: {events}")
         else:
             print(f"    {data}")
-    
-    # Generate and save comprehensive report
+
+
+def print_matches(match_results):
+    # Match analysis (per match across a process pool, then league-wide)
+    print("\n7. Match Analysis:")
+    for key, value in match_results['league_summary'].items():
+        print(f"  {key}: {value}")
+    print(match_results['league_table'].head())
+
+
+def print_league_stats(league_stats):
+    # Per league and season, from the events joined to the match metadata (ginf.csv)
+    print("\n8. League & Season Analysis:")
+    if not league_stats.empty:
+        print(league_stats.head(10))
+    else:
+        print("  No events match the match metadata")
+
+
+SECTION_PRINTERS = {
+    'overview': print_overview,
+    'team_stats': print_team_stats,
+    'player_stats': print_player_stats,
+    'location_stats': print_location_stats,
+    'discipline_stats': print_discipline_stats,
+    'time_stats': print_time_stats,
+    'matches': print_matches,
+    'league_stats': print_league_stats,
+}
+
+
+def to_jsonable(value):
+    """Convert analysis results (DataFrames, sets, numpy scalars) to JSON-serializable values"""
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        items = sorted(value, key=str) if isinstance(value, set) else value
+        return [to_jsonable(item) for item in items]
+    if hasattr(value, 'reset_index') and hasattr(value, 'to_dict'):
+        return to_jsonable(value.reset_index().to_dict(orient='records'))
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def raw_file_exists(file_name: str) -> bool:
+    """Whether a file name resolves like src.loader does: an existing path, or a name under data/raw"""
+    return os.path.isfile(file_name) or os.path.isfile(os.path.join(os.path.dirname(__file__), 'data', 'raw', file_name))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze football match events")
+    parser.add_argument('input', nargs='?', default='events.csv',
+                        help="Events CSV: a file name under data/raw or a path (default: events.csv)")
+    parser.add_argument('--analyses', default='all',
+                        help=f"Comma-separated analyses to run: {','.join(ANALYSIS_NAMES)} (default: all)")
+    parser.add_argument('--ginf', default='ginf.csv',
+                        help="Match metadata file under data/raw or a path, for the league analysis (default: ginf.csv)")
+    parser.add_argument('--no-plots', action='store_true', help="Skip the dashboard plots")
+    parser.add_argument('--no-exports', action='store_true', help="Skip the CSV exports")
+    parser.add_argument('--no-report', action='store_true', help="Skip the text report")
+    parser.add_argument('--format', choices=['text', 'json'], default='text',
+                        help="Console output: readable sections or one JSON document")
+    parser.add_argument('--stream', action='store_true',
+                        help="Analyze the file in chunks with bounded memory (no plots, exports or matches)")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="Rows per chunk with --stream")
+    parser.add_argument('--workers', type=int, default=None, help="Worker threads / processes")
+    parser.add_argument('--no-cache', action='store_true', help="Recompute every pipeline stage")
+    parser.add_argument('--export-format', choices=['csv', 'parquet', 'arrow'], default='csv',
+                        help="Format of the data exports (default: csv)")
+    parser.add_argument('--compression', default='default',
+                        help="Export codec, or 'none' (default: none for csv, zstd for parquet, lz4 for arrow)")
+    parser.add_argument('--partition-by', default=None,
+                        help="Comma-separated columns to Hive-partition the processed events by, e.g. event_team")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Export events per match (or --partition-by value) to output/summaries/processed_events/, "
+                             "rewriting only partitions that changed since the last export")
+    parser.add_argument('--dedup-key', default=None,
+                        help="Comma-separated column(s) identifying duplicate rows (default: all columns)")
+    parser.add_argument('--seen-keys', default=None,
+                        help="With --stream: directory of keys seen in earlier runs, so files appended "
+                             "over time are deduplicated against each other")
+    parser.add_argument('--profile', action='store_true',
+                        help="Print wall/CPU time, rows and memory per loader, cleaner, analyzer and plot function")
+    parser.add_argument('--profile-json', default=None, help="Write the profile records as JSON to this file")
+    parser.add_argument('--profile-dir', default=None, help="Dump a cProfile (.prof) per profiled stage here")
+    args = parser.parse_args(argv)
+    args.profile = args.profile or bool(args.profile_json or args.profile_dir)
+
+    if args.analyses == 'all':
+        args.analyses = list(ANALYSIS_NAMES.values())
+        # The league analysis needs the match metadata, which not every dataset ships
+        if not raw_file_exists(args.ginf):
+            args.analyses.remove('league_stats')
+    else:
+        names = [name.strip() for name in args.analyses.split(',') if name.strip()]
+        unknown = [name for name in names if name not in ANALYSIS_NAMES]
+        if unknown:
+            parser.error(f"unknown analyses: {', '.join(unknown)} (choose from {', '.join(ANALYSIS_NAMES)})")
+        args.analyses = [ANALYSIS_NAMES[name] for name in names]
+    args.export_options = {
+        'fmt': args.export_format,
+        'compression': None if args.compression == 'none' else args.compression,
+        'partition_cols': [name.strip() for name in args.partition_by.split(',')] if args.partition_by else None,
+        'incremental': args.incremental,
+    }
+    if args.dedup_key:
+        args.dedup_key = [name.strip() for name in args.dedup_key.split(',') if name.strip()]
+    if args.seen_keys and not args.stream:
+        parser.error("--seen-keys requires --stream")
+    if args.stream:
+        args.analyses = [name for name in args.analyses if name not in ('matches', 'league_stats')]
+        args.no_plots = args.no_exports = True
+    return args
+
+
+def run_pipeline(args) -> dict:
+    """Run the pipeline stages for the requested outputs and return their results"""
+    from src.exporter import new_run_id
+    from src.pipeline import build_events_pipeline
+    from src.schema import EVENTS_DTYPES
+
+    # One id per run names the report, export files and their manifest
+    run_id = new_run_id()
+
+    # Stages whose inputs are unchanged since the last run are read from the
+    # stage cache, independent stages run concurrently
+    pipeline = build_events_pipeline(matches='matches' in args.analyses, report=not args.no_report,
+                                     exports=not args.no_exports, plots=not args.no_plots,
+                                     workers=args.workers, dedup_key=args.dedup_key,
+                                     export_options=args.export_options, run_id=run_id,
+                                     league='league_stats' in args.analyses)
+    targets = list(args.analyses)
+    targets += [] if args.no_report else ['report']
+    targets += [] if args.no_exports else ['exports']
+    targets += [name for name in pipeline.stages if name.endswith('_plot')]
+
+    print(f"Running pipeline (run {run_id})...")
+    params = {'file_name': args.input, 'columns': COLUMNS_TO_KEEP, 'dtype': EVENTS_DTYPES, 'ginf_file': args.ginf}
+    results = pipeline.run(params, targets=targets, use_cache=not args.no_cache)
+    print(pipeline.report())
+    return results
+
+
+def run_streaming(args) -> dict:
+    """Analyze the input in chunks and write the report from the merged results"""
+    from src.cleaner import SeenKeys
+    from src.schema import EVENTS_DTYPES
+    from src.streaming import run_streaming_analysis
+
+    print("Streaming analysis...")
+    results = run_streaming_analysis(args.input, columns=COLUMNS_TO_KEEP, dtype=EVENTS_DTYPES,
+                                     chunksize=args.chunksize, dedup_key=args.dedup_key,
+                                     seen_keys=SeenKeys(args.seen_keys) if args.seen_keys else None)
+    if not args.no_report:
+        from src.analyzer import save_report_to_file
+        results['report'] = save_report_to_file(None, results=results)
+    return {name: value for name, value in results.items() if name in args.analyses or name == 'report'}
+
+
+def print_profile(args) -> None:
+    """Print the per-stage timing table and write the JSON / cProfile outputs that were asked for"""
+    from src.profiling import PROFILER
+
+    print("\nStage profile (cached pipeline stages don't run and aren't listed):")
+    print(PROFILER.report())
+    if args.profile_json:
+        PROFILER.to_json(args.profile_json)
+        print(f"Profile saved to: {args.profile_json}")
+    if args.profile_dir:
+        print(f"cProfile dumps saved to: {args.profile_dir}")
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.profile:
+        from src.profiling import PROFILER
+        PROFILER.enable(profile_dir=args.profile_dir)
+
+    # Keep stdout for the JSON document; progress goes to stderr
+    progress = contextlib.redirect_stdout(sys.stderr) if args.format == 'json' else contextlib.nullcontext()
+    with progress:
+        results = run_streaming(args) if args.stream else run_pipeline(args)
+        if args.profile:
+            print_profile(args)
+
+    missing = [name for name in args.analyses if name not in results]
+    plot_paths = [value[0] for name, value in results.items() if name.endswith('_plot')]
+
+    if args.format == 'json':
+        document = {name: results[name] for name in args.analyses if name in results}
+        for output in ('report', 'exports'):
+            if output in results:
+                document[output] = results[output]
+        if plot_paths:
+            document['plots'] = plot_paths
+        json.dump(to_jsonable(document), sys.stdout, indent=2)
+        print()
+        return 1 if missing else 0
+
+    # Generate analyses
     print("\n" + "="*50)
-    print("GENERATING REPORTS & VISUALIZATIONS")
+    print("RUNNING ANALYSES")
     print("="*50)
-    
-    try:
-        # Import the new functions
-        from src.analyzer import save_report_to_file, save_data_exports
-        
-        # Save detailed report to file
-        report_path = save_report_to_file(df_final)
-        print(f"✅ Detailed report saved to: {report_path}")
-        
-        # Save data exports
-        exported_files = save_data_exports(df_final)
+    for name in args.analyses:
+        if name in results:
+            SECTION_PRINTERS[name](results[name])
+        else:
+            print(f"\n❌ {name} is not available (see the pipeline errors above)")
+
+    # Reports and visualizations
+    if 'report' in results or 'exports' in results or plot_paths:
+        print("\n" + "="*50)
+        print("GENERATING REPORTS & VISUALIZATIONS")
+        print("="*50)
+
+    if 'report' in results:
+        print(f"✅ Detailed report saved to: {results['report']}")
+
+    if 'exports' in results:
         print(f"✅ Data exports saved:")
-        for file_type, path in exported_files.items():
+        for file_type, path in results['exports'].items():
             print(f"   {file_type}: {path}")
-        
-        # Create visualization dashboard
-        print(f"\n📈 Creating visualization dashboard...")
-        plot_paths = create_dashboard(df_final)
+
+    if plot_paths:
         print(f"✅ Visualizations saved:")
         for plot_path in plot_paths:
             print(f"   📊 {os.path.basename(plot_path)}")
-        
-        
-        # Display summary in console
+
+    # Display summary in console
+    if 'report' in results:
         print("\n" + "="*50)
         print("SUMMARY REPORT PREVIEW")
         print("="*50)
-        summary = generate_summary_report(df_final)
+        with open(results['report'], encoding='utf-8') as f:
+            summary = f.read()
         print(summary[:1000] + "..." if len(summary) > 1000 else summary)
-        print(f"\nFull report available at: {report_path}")
-        
-    except Exception as e:
-        print(f"❌ Error generating reports: {e}")
-        print("Displaying summary in console only:")
-        summary = generate_summary_report(df_final)
-        print(summary)
+        print(f"\nFull report available at: {results['report']}")
+
+    from src.cache import RESULT_CACHE
+    cache_info = RESULT_CACHE.info()
+    print(f"\nAnalysis cache: {cache_info['hits']} hits, {cache_info['misses']} misses")
+    return 1 if missing else 0
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())